@@ -6,12 +6,24 @@ Loads and serves processed Ansys documentation for the MCP server.
 Provides structured access to Ansys Workbench scripting resources.
 """
 
+import heapq
 import json
 import os
 import re
+import threading
+from bisect import bisect_right
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+
+# orjson parses the large extracted JSON files considerably faster when available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 class AnsysResourceLoader:
     """Manages loading and serving Ansys documentation resources."""
@@ -27,6 +39,39 @@ class AnsysResourceLoader:
         self._resource_cache = {}
         self._index_cache = None
         self._pdf_cache = None
+        self._code_example_index = None
+
+        # Serializes the lazy loads so concurrent first requests parse each file once
+        # (reentrant because building the code example index loads the PDF data)
+        self._load_lock = threading.RLock()
+
+        # Callbacks that clear caches built on top of the loader's data
+        self._invalidate_callbacks = []
+
+    def on_invalidate(self, callback):
+        """Register a callback to run whenever invalidate() drops the cached data."""
+        self._invalidate_callbacks.append(callback)
+        return callback
+
+    def invalidate(self):
+        """Drop all cached data so the next request reloads it from disk."""
+        with self._load_lock:
+            self._resource_cache.clear()
+            self._index_cache = None
+            self._pdf_cache = None
+            self._code_example_index = None
+        get_resource_content.cache_clear()
+        for callback in self._invalidate_callbacks:
+            callback()
+
+    def warm_up(self):
+        """Load all extracted data and generate every resource ahead of the first request."""
+        self.get_resource_index()
+        self.get_pdf_data()
+        self.get_pymechanical_docs()
+        self._get_code_example_index()
+        for resource_name in RESOURCE_GENERATORS:
+            get_resource_content(resource_name)
 
     def _load_json_file(self, file_path: Path) -> Optional[Dict]:
         """Load and cache a JSON file."""
@@ -34,6 +79,11 @@ class AnsysResourceLoader:
             return None
 
         try:
+            if ORJSON_AVAILABLE:
+                try:
+                    return orjson.loads(file_path.read_bytes())
+                except orjson.JSONDecodeError:
+                    pass  # e.g. NaN values, which only the stdlib parser accepts
             with open(file_path, 'r', encoding='utf-8') as f:
                 return json.load(f)
         except Exception as e:
@@ -43,8 +93,10 @@ class AnsysResourceLoader:
     def get_resource_index(self) -> Dict:
         """Get the main resource index."""
         if self._index_cache is None:
-            index_file = self.metadata_dir / "resource_index.json"
-            self._index_cache = self._load_json_file(index_file) or {}
+            with self._load_lock:
+                if self._index_cache is None:
+                    index_file = self.metadata_dir / "resource_index.json"
+                    self._index_cache = self._load_json_file(index_file) or {}
         return self._index_cache
 
     def get_search_index(self) -> Dict:
@@ -55,36 +107,56 @@ class AnsysResourceLoader:
     def get_pymechanical_docs(self) -> Dict:
         """Get processed PyMechanical documentation."""
         if "pymechanical" not in self._resource_cache:
-            docs_file = self.extracted_dir / "mechanical.docs.pyansys.com_processed.json"
-            self._resource_cache["pymechanical"] = self._load_json_file(docs_file) or {}
+            with self._load_lock:
+                if "pymechanical" not in self._resource_cache:
+                    docs_file = self.extracted_dir / "mechanical.docs.pyansys.com_processed.json"
+                    self._resource_cache["pymechanical"] = self._load_json_file(docs_file) or {}
         return self._resource_cache["pymechanical"]
 
     def get_mechanical_api_docs(self) -> Dict:
         """Get processed Mechanical API documentation."""
         if "mechanical_api" not in self._resource_cache:
-            api_file = self.extracted_dir / "scripting.mechanical.docs.pyansys.com_processed.json"
-            self._resource_cache["mechanical_api"] = self._load_json_file(api_file) or {}
+            with self._load_lock:
+                if "mechanical_api" not in self._resource_cache:
+                    api_file = self.extracted_dir / "scripting.mechanical.docs.pyansys.com_processed.json"
+                    self._resource_cache["mechanical_api"] = self._load_json_file(api_file) or {}
         return self._resource_cache["mechanical_api"]
 
     def get_complete_data(self) -> Dict:
         """Get all processed data combined."""
         if "complete" not in self._resource_cache:
-            complete_file = self.extracted_dir / "complete_extracted_data.json"
-            self._resource_cache["complete"] = self._load_json_file(complete_file) or {}
+            with self._load_lock:
+                if "complete" not in self._resource_cache:
+                    complete_file = self.extracted_dir / "complete_extracted_data.json"
+                    self._resource_cache["complete"] = self._load_json_file(complete_file) or {}
         return self._resource_cache["complete"]
 
     def get_pdf_data(self) -> Dict:
         """Get extracted PDF content."""
         if self._pdf_cache is None:
-            pdf_file = self.extracted_dir / "pdf_extracted_content.json"
-            self._pdf_cache = self._load_json_file(pdf_file) or {}
+            with self._load_lock:
+                if self._pdf_cache is None:
+                    pdf_file = self.extracted_dir / "pdf_extracted_content.json"
+                    self._pdf_cache = self._load_json_file(pdf_file) or {}
         return self._pdf_cache
 
     def search_content(self, query: str, max_results: int = 10) -> List[Dict]:
         """Search across all documentation content."""
-        results = []
         query_lower = query.lower()
 
+        # Rank matches as they are found, keeping only the top results
+        top_matches = heapq.nlargest(max_results, self._iter_matches(query_lower), key=itemgetter(0))
+
+        # Extract context only for the results that are returned
+        results = []
+        for relevance, text, result in top_matches:
+            result["context"] = self._extract_context(text, query_lower)
+            result["relevance_score"] = relevance
+            results.append(result)
+        return results
+
+    def _iter_matches(self, query_lower: str) -> Iterator[Tuple[float, str, Dict]]:
+        """Yield (relevance, text, result) for every match of a lowercased query."""
         # Search PDF content
         pdf_data = self.get_pdf_data()
         for pdf_name, pdf_content in pdf_data.get("pdfs", {}).items():
@@ -92,15 +164,11 @@ class AnsysResourceLoader:
                 for page in pdf_content["pages"]:
                     text = page.get("clean_text", "")
                     if query_lower in text.lower():
-                        # Find context around the match
-                        context = self._extract_context(text, query_lower)
-                        results.append({
+                        yield self._calculate_relevance(text, query_lower), text, {
                             "source": pdf_name,
                             "type": "pdf",
-                            "page": page.get("page_number"),
-                            "context": context,
-                            "relevance_score": self._calculate_relevance(text, query_lower)
-                        })
+                            "page": page.get("page_number")
+                        }
 
         # Search HTML content
         html_data = self.get_pymechanical_docs()
@@ -109,19 +177,12 @@ class AnsysResourceLoader:
                 content_text = item.get("content", "")
                 title = item.get("title", "")
                 if query_lower in content_text.lower() or query_lower in title.lower():
-                    context = self._extract_context(content_text, query_lower)
-                    results.append({
+                    yield self._calculate_relevance(content_text + " " + title, query_lower), content_text, {
                         "source": "PyMechanical Docs",
                         "type": "html",
                         "title": title,
-                        "file": item.get("file"),
-                        "context": context,
-                        "relevance_score": self._calculate_relevance(content_text + " " + title, query_lower)
-                    })
-
-        # Sort by relevance and return top results
-        results.sort(key=lambda x: x["relevance_score"], reverse=True)
-        return results[:max_results]
+                        "file": item.get("file")
+                    }
 
     def _extract_context(self, text: str, query: str, context_size: int = 300) -> str:
         """Extract context around a search query match."""
@@ -159,38 +220,56 @@ class AnsysResourceLoader:
         pdf_content = pdf_data.get("pdfs", {}).get(pdf_name, {})
         return pdf_content.get("chapters", [])
 
-    def get_pdf_content_by_chapter(self, pdf_name: str, chapter_title: str) -> Dict:
-        """Get content from a specific chapter in a PDF."""
+    def get_pdf_content_by_chapter(self, pdf_name: str, chapter_title: str, max_chars: Optional[int] = None) -> Dict:
+        """Get content from a specific chapter in a PDF.
+
+        When max_chars is given, only enough pages to fill that many characters
+        are joined and the result's "truncated" flag reports whether more remained.
+        """
         pdf_data = self.get_pdf_data()
         pdf_content = pdf_data.get("pdfs", {}).get(pdf_name, {})
 
         chapters = pdf_content.get("chapters", [])
-        for chapter in chapters:
+        for current_idx, chapter in enumerate(chapters):
             if chapter_title.lower() in chapter.get("title", "").lower():
                 # Extract pages for this chapter
                 start_page = chapter.get("start_page", 1)
                 pages = pdf_content.get("pages", [])
 
-                # Find chapter content
-                chapter_pages = [p for p in pages if p.get("page_number", 0) >= start_page]
-
                 # Try to find end page by looking at next chapter
                 next_chapter_page = None
-                current_idx = chapters.index(chapter)
                 if current_idx + 1 < len(chapters):
                     next_chapter_page = chapters[current_idx + 1].get("start_page")
 
-                if next_chapter_page:
-                    chapter_pages = [p for p in chapter_pages if p.get("page_number", 0) < next_chapter_page]
+                # Select chapter pages lazily so a max_chars preview stops early
+                chapter_pages = (
+                    p for p in pages
+                    if p.get("page_number", 0) >= start_page
+                    and (not next_chapter_page or p.get("page_number", 0) < next_chapter_page)
+                )
 
                 # Combine chapter text
-                chapter_text = "\n".join([p.get("clean_text", "") for p in chapter_pages])
+                if max_chars is None:
+                    chapter_text = "\n".join([p.get("clean_text", "") for p in chapter_pages])
+                    truncated = False
+                else:
+                    page_texts = []
+                    length = -1  # No separator before the first page
+                    for p in chapter_pages:
+                        page_texts.append(p.get("clean_text", ""))
+                        length += len(page_texts[-1]) + 1
+                        if length > max_chars:
+                            break
+                    chapter_text = "\n".join(page_texts)
+                    truncated = len(chapter_text) > max_chars
+                    chapter_text = chapter_text[:max_chars]
 
                 return {
                     "title": chapter.get("title"),
                     "start_page": start_page,
                     "end_page": next_chapter_page - 1 if next_chapter_page else len(pages),
                     "content": chapter_text,
+                    "truncated": truncated,
                     "sections": chapter.get("sections", [])
                 }
 
@@ -210,6 +289,47 @@ class AnsysResourceLoader:
 
         return examples
 
+    def _get_code_example_index(self) -> Tuple[List[Dict], str, List[int]]:
+        """Get code examples with one lowercased corpus of their code and context.
+
+        Returns the examples, the corpus, and the offset at which each example's
+        text starts in the corpus (plus a final end offset).
+        """
+        if self._code_example_index is None:
+            with self._load_lock:
+                if self._code_example_index is None:
+                    examples = self.get_code_examples()
+                    texts = [f"{ex.get('code', '')}\0{ex.get('context', '')}".lower() for ex in examples]
+                    offsets = [0]
+                    for text in texts:
+                        offsets.append(offsets[-1] + len(text) + 1)
+                    self._code_example_index = (examples, "\x01".join(texts), offsets)
+        return self._code_example_index
+
+    def find_code_examples(self, topic: str, max_results: int = 5) -> List[Dict]:
+        """Find code examples whose code or context mentions a topic."""
+        examples, corpus, offsets = self._get_code_example_index()
+        if not examples:
+            return []
+
+        topic_lower = topic.lower()
+        matches = []
+        pos = 0
+
+        # Scan the whole corpus with str.find and map each hit to its example
+        while len(matches) < max_results:
+            pos = corpus.find(topic_lower, pos)
+            if pos == -1:
+                break
+            idx = bisect_right(offsets, pos) - 1
+            if pos + len(topic_lower) < offsets[idx + 1]:
+                matches.append(examples[idx])
+                pos = offsets[idx + 1]
+            else:
+                pos += 1  # Hit spans two examples
+
+        return matches
+
     def get_api_references(self, source: str = "all") -> List[Dict]:
         """Get API references from documentation."""
         references = []
@@ -1099,21 +1219,28 @@ For detailed API usage:
 
     return guide_content
 
+# Resource generators by resource name
+RESOURCE_GENERATORS = {
+    "workbench_overview": get_ansys_workbench_overview,
+    "pymechanical_architecture": get_pymechanical_architecture,
+    "cpython_vs_ironpython": get_cpython_vs_ironpython_guide,
+    "quick_reference": get_quick_reference_guide,
+    "act_development": get_act_development_guide,
+    "dpf_post_processing": get_dpf_post_processing_guide,
+    "scripting_examples": get_scripting_examples_guide,
+    "api_reference": get_api_reference_guide
+}
+
 # Main resource functions that will be used by the MCP server
+@lru_cache(maxsize=32)
 def get_resource_content(resource_name: str) -> str:
-    """Get content for a specific resource."""
-    resource_map = {
-        "workbench_overview": get_ansys_workbench_overview,
-        "pymechanical_architecture": get_pymechanical_architecture,
-        "cpython_vs_ironpython": get_cpython_vs_ironpython_guide,
-        "quick_reference": get_quick_reference_guide,
-        "act_development": get_act_development_guide,
-        "dpf_post_processing": get_dpf_post_processing_guide,
-        "scripting_examples": get_scripting_examples_guide,
-        "api_reference": get_api_reference_guide
-    }
-
-    if resource_name in resource_map:
-        return resource_map[resource_name]()
+    """Get content for a specific resource.
+
+    Resource bodies are built from static extracted data, so each one is
+    generated once per process; call ``resource_loader.invalidate()`` to
+    rebuild them after the extracted data changes.
+    """
+    if resource_name in RESOURCE_GENERATORS:
+        return RESOURCE_GENERATORS[resource_name]()
     else:
         return f"Resource '{resource_name}' not found."
\ No newline at end of file
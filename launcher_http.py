@@ -9,29 +9,84 @@ This launcher:
 4. Handles cleanup when done
 """
 
+import importlib.util
+import os
+import select
 import subprocess
 import sys
+import threading
 import time
 from pathlib import Path
 import signal
 import requests
 
 
+PROJECT_ROOT = Path(__file__).resolve().parent
+
+# Text MCP Inspector prints once its web interface is serving
+INSPECTOR_READY_MARKER = b"is up and running"
+
+
+def is_installed(module_name):
+    """Check whether a top-level module is installed, without importing it.
+
+    For a dotted name find_spec imports the parent packages, so submodules
+    are better checked with a real import.
+    """
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def wait_for_exit(process, timeout):
+    """Wait up to timeout seconds for a process to exit; return True if it did.
+
+    On Linux the wait sleeps on a pidfd, so it wakes as soon as the process
+    exits; elsewhere it falls back to Popen.wait.
+    """
+    if process.poll() is not None:
+        return True
+
+    try:
+        pidfd = os.pidfd_open(process.pid)
+    except (AttributeError, OSError):
+        try:
+            process.wait(timeout=timeout)
+            return True
+        except subprocess.TimeoutExpired:
+            return False
+
+    try:
+        poller = select.poll()
+        poller.register(pidfd, select.POLLIN)
+        if not poller.poll(timeout * 1000):
+            return False
+    finally:
+        os.close(pidfd)
+
+    process.wait()
+    return True
+
+
 class MCPHTTPLauncher:
     def __init__(self):
         self.server_process = None
         self.inspector_process = None
-        self.project_dir = Path(__file__).parent.absolute()
+        self.project_dir = PROJECT_ROOT
         self.server_path = self.project_dir / "server_http.py"
         self.server_url = "http://127.0.0.1:8001"
         self.sse_url = "http://127.0.0.1:8001/sse"
         self.venv_python = self.project_dir / ".venv" / "bin" / "python"
+        self.inspector_output = bytearray()
+        self.inspector_ready = threading.Event()
 
     def check_dependencies(self):
         """Check if required dependencies are installed."""
         print("🔍 Checking dependencies...")
 
         # Check Python dependencies
+        # Imported for real: the server needs this exact API, not just the package
         try:
             import mcp.server.fastmcp
             print("✓ MCP FastMCP library found")
@@ -39,10 +94,9 @@ class MCPHTTPLauncher:
             print("✗ MCP FastMCP library not found")
             return False
 
-        try:
-            import fitz  # PyMuPDF
+        if is_installed("fitz"):  # PyMuPDF
             print("✓ PyMuPDF for PDF processing found")
-        except ImportError:
+        else:
             print("✗ PyMuPDF not found. Installing...")
             try:
                 subprocess.run([sys.executable, "-m", "pip", "install", "PyMuPDF"], check=True)
@@ -51,11 +105,9 @@ class MCPHTTPLauncher:
                 print("✗ Failed to install PyMuPDF")
                 return False
 
-        try:
-            import uvicorn
-            import starlette
+        if is_installed("uvicorn") and is_installed("starlette"):
             print("✓ HTTP server dependencies found")
-        except ImportError:
+        else:
             print("✗ HTTP server dependencies missing. Installing...")
             try:
                 subprocess.run([sys.executable, "-m", "pip", "install", "uvicorn", "starlette"], check=True)
@@ -86,11 +138,16 @@ class MCPHTTPLauncher:
             # Use virtual environment python if available
             python_cmd = str(self.venv_python) if self.venv_python.exists() else "python"
 
+            # Pin the server to the address probed below, whatever the shell exports
+            env = dict(os.environ, MCP_HOST="127.0.0.1", MCP_PORT="8001")
+            env.pop("MCP_UDS", None)
+
             self.server_process = subprocess.Popen(
                 [python_cmd, str(self.server_path)],
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                cwd=str(self.project_dir)
+                cwd=str(self.project_dir),
+                env=env
             )
 
             # Wait for server to start
@@ -103,8 +160,14 @@ class MCPHTTPLauncher:
                     if response.status_code in [200, 404]:  # Server is responding
                         break
                 except requests.exceptions.RequestException:
-                    time.sleep(1)
-                    continue
+                    pass
+
+                # Wait before retrying, but stop as soon as the server exits
+                if wait_for_exit(self.server_process, 1):
+                    print("✗ Server exited during startup")
+                    stderr_output = self.server_process.stderr.read().decode(errors="replace")
+                    print(f"Error output: {stderr_output}")
+                    return False
             else:
                 print("✗ Server failed to start (timeout)")
                 return False
@@ -125,20 +188,23 @@ class MCPHTTPLauncher:
                 ["npx", "@modelcontextprotocol/inspector", "--transport", "sse", "--server-url", self.sse_url],
                 cwd=str(self.project_dir),
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
+                stderr=subprocess.STDOUT
             )
 
-            # Give it time to start
+            # Keep reading its output so the pipe never fills, and wait until it
+            # reports being ready (or exits) instead of sleeping a fixed time
+            started = time.monotonic()
+            threading.Thread(target=self._drain_inspector_output, daemon=True).start()
             print("⏳ Waiting for MCP Inspector to initialize...")
-            time.sleep(5)
+            ready = self.inspector_ready.wait(timeout=8)
+            elapsed_ms = (time.monotonic() - started) * 1000
 
             # Check if the process is still running
             if self.inspector_process.poll() is None:
-                print("✓ MCP Inspector started successfully")
-
-                # Wait a bit more for the web server to be ready
-                print("⏳ Waiting for web interface to be ready...")
-                time.sleep(3)
+                if ready:
+                    print(f"✓ MCP Inspector started successfully ({elapsed_ms:.0f} ms)")
+                else:
+                    print(f"⚠️  MCP Inspector still starting after {elapsed_ms:.0f} ms; continuing")
 
                 # MCP Inspector will open automatically with pre-configured settings
                 print(f"🌐 MCP Inspector started with SSE transport pre-configured")
@@ -150,58 +216,78 @@ class MCPHTTPLauncher:
                 return True
             else:
                 print("✗ MCP Inspector failed to start")
-                stderr_output = self.inspector_process.stderr.read().decode() if self.inspector_process.stderr else "No error output"
-                print(f"Error output: {stderr_output}")
+                # Once the drain thread has seen EOF the buffer holds all output
+                self.inspector_ready.wait(timeout=1)
+                error_output = self.inspector_output.decode(errors="replace") or "No error output"
+                print(f"Error output: {error_output}")
                 return False
 
         except Exception as e:
             print(f"✗ Failed to start MCP Inspector: {e}")
             return False
 
+    def _drain_inspector_output(self):
+        """Collect MCP Inspector output and flag when it reports being ready."""
+        output = self.inspector_output
+        for chunk in iter(lambda: self.inspector_process.stdout.read1(4096), b""):
+            # Only the new bytes (plus enough overlap for a split marker) need searching
+            start = max(len(output) - len(INSPECTOR_READY_MARKER) + 1, 0)
+            output += chunk
+            if output.find(INSPECTOR_READY_MARKER, start) != -1:
+                self.inspector_ready.set()
+
+        # Output closed: the inspector is exiting
+        self.inspector_process.wait()
+        self.inspector_ready.set()
+
     def print_connection_instructions(self):
         """Print clear instructions for connecting via HTTP."""
-        print("\n" + "="*70)
-        print("🎉 READY TO CONNECT VIA HTTP!")
-        print("="*70)
-        print("\n📋 In the MCP Inspector web interface, use these settings:")
-        print("\n┌─ HTTP Connection Settings ────────────────────────────────┐")
-        print("│                                                           │")
-        print("│  Transport Type:   sse                                    │")
-        print(f"│  Server URL:       {self.sse_url}                         │")
-        print("│                                                           │")
-        print("└───────────────────────────────────────────────────────────┘")
-        print("\n🔧 Connection is fully automatic:")
-        print("   ✓ Transport Type: SSE (pre-configured)")
-        print(f"   ✓ Server URL: {self.sse_url} (pre-configured)")
-        print("   ✓ Should connect automatically on startup")
-        print("   → If not connected, click 'Connect' button")
-        print("   → Navigate to 'Resources' or 'Prompts' tabs to test")
-        print("\n📦 Available resources (9 total):")
-        print("   • ansys://workbench/overview - Workbench automation overview")
-        print("   • ansys://pymechanical/architecture - PyMechanical implementation details")
-        print("   • ansys://python/cpython-vs-ironpython - Python implementation comparison")
-        print("   • ansys://reference/quick-guide - Quick reference for common tasks")
-        print("   • ansys://act/development - ACT development guide")
-        print("   • ansys://dpf/post-processing - DPF post-processing reference")
-        print("   • ansys://scripting/examples - Comprehensive scripting examples")
-        print("   • ansys://api/reference - API reference documentation")
-        print("\n🛠️  Available tools (3 total):")
-        print("   • search_ansys_docs - Search across 2000+ pages of documentation")
-        print("   • get_code_example - Find code examples for specific topics")
-        print("   • get_chapter_content - Extract specific chapters from PDF manuals")
-        print("\n🎯 Available prompts (3 total):")
-        print("   • generate_ansys_script - Generate automation scripts")
-        print("   • debug_ansys_error - Diagnose and resolve scripting errors")
-        print("   • convert_ironpython_to_cpython - Migrate legacy scripts")
-        print("\n📚 Documentation corpus:")
-        print("   • 40+ MB extracted from 2042 pages across 4 Ansys manuals")
-        print("   • Full-text search with relevance scoring")
-        print("   • Chapter-level access to PDF content")
-        print(f"\n🌐 Server running at: {self.server_url}")
-        print(f"📡 SSE endpoint at: {self.sse_url}")
-        print("\n⚠️  Keep this terminal window open while using MCP Inspector!")
-        print("   Press Ctrl+C to stop both services when you're done.")
-        print("="*70)
+        lines = [
+            "\n" + "="*70,
+            "🎉 READY TO CONNECT VIA HTTP!",
+            "="*70,
+            "\n📋 In the MCP Inspector web interface, use these settings:",
+            "\n┌─ HTTP Connection Settings ────────────────────────────────┐",
+            "│                                                           │",
+            "│  Transport Type:   sse                                    │",
+            f"│  Server URL:       {self.sse_url}                         │",
+            "│                                                           │",
+            "└───────────────────────────────────────────────────────────┘",
+            "\n🔧 Connection is fully automatic:",
+            "   ✓ Transport Type: SSE (pre-configured)",
+            f"   ✓ Server URL: {self.sse_url} (pre-configured)",
+            "   ✓ Should connect automatically on startup",
+            "   → If not connected, click 'Connect' button",
+            "   → Navigate to 'Resources' or 'Prompts' tabs to test",
+            "\n📦 Available resources (9 total):",
+            "   • ansys://workbench/overview - Workbench automation overview",
+            "   • ansys://pymechanical/architecture - PyMechanical implementation details",
+            "   • ansys://python/cpython-vs-ironpython - Python implementation comparison",
+            "   • ansys://reference/quick-guide - Quick reference for common tasks",
+            "   • ansys://act/development - ACT development guide",
+            "   • ansys://dpf/post-processing - DPF post-processing reference",
+            "   • ansys://scripting/examples - Comprehensive scripting examples",
+            "   • ansys://api/reference - API reference documentation",
+            "\n🛠️  Available tools (3 total):",
+            "   • search_ansys_docs - Search across 2000+ pages of documentation",
+            "   • get_code_example - Find code examples for specific topics",
+            "   • get_chapter_content - Extract specific chapters from PDF manuals",
+            "\n🎯 Available prompts (3 total):",
+            "   • generate_ansys_script - Generate automation scripts",
+            "   • debug_ansys_error - Diagnose and resolve scripting errors",
+            "   • convert_ironpython_to_cpython - Migrate legacy scripts",
+            "\n📚 Documentation corpus:",
+            "   • 40+ MB extracted from 2042 pages across 4 Ansys manuals",
+            "   • Full-text search with relevance scoring",
+            "   • Chapter-level access to PDF content",
+            f"\n🌐 Server running at: {self.server_url}",
+            f"📡 SSE endpoint at: {self.sse_url}",
+            "\n⚠️  Keep this terminal window open while using MCP Inspector!",
+            "   Press Ctrl+C to stop both services when you're done.",
+            "="*70,
+        ]
+        # One write instead of a print (and a flush, on a terminal) per line
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def cleanup(self):
         """Clean up running processes."""
@@ -209,22 +295,22 @@ class MCPHTTPLauncher:
 
         if self.server_process:
             print("  Stopping MCP HTTP Server...")
-            try:
-                self.server_process.terminate()
-                self.server_process.wait(timeout=5)
+            self.server_process.terminate()
+            if wait_for_exit(self.server_process, 5):
                 print("  ✓ MCP HTTP Server stopped")
-            except subprocess.TimeoutExpired:
+            else:
                 self.server_process.kill()
+                self.server_process.wait()
                 print("  ✓ MCP HTTP Server stopped (forced)")
 
         if self.inspector_process:
             print("  Stopping MCP Inspector...")
-            try:
-                self.inspector_process.terminate()
-                self.inspector_process.wait(timeout=5)
+            self.inspector_process.terminate()
+            if wait_for_exit(self.inspector_process, 5):
                 print("  ✓ MCP Inspector stopped")
-            except subprocess.TimeoutExpired:
+            else:
                 self.inspector_process.kill()
+                self.inspector_process.wait()
                 print("  ✓ MCP Inspector stopped (forced)")
 
     def run(self):
@@ -10,9 +10,11 @@ import os
 import sys
 import json
 import re
+import importlib
 from pathlib import Path
 from datetime import datetime
 import hashlib
+from concurrent.futures import ProcessPoolExecutor
 
 # Try to import PDF processing libraries
 try:
@@ -27,6 +29,12 @@ try:
 except ImportError:
     BS4_AVAILABLE = False
 
+# Optional dependencies: (pip package, module, attribute bound globally, availability flag)
+OPTIONAL_DEPENDENCIES = [
+    ("PyPDF2", "PyPDF2", None, "PDF_AVAILABLE"),
+    ("beautifulsoup4", "bs4", "BeautifulSoup", "BS4_AVAILABLE"),
+]
+
 # Get the project root directory
 PROJECT_ROOT = Path(__file__).parent.parent
 RESOURCES_DIR = PROJECT_ROOT / "resources"
@@ -35,13 +43,20 @@ HTML_DIR = RESOURCES_DIR / "docs" / "html"
 EXTRACTED_DIR = RESOURCES_DIR / "docs" / "extracted"
 TEMPLATES_DIR = RESOURCES_DIR / "templates"
 
+def _bind_dependencies():
+    """Import newly installed dependencies once and bind them to module globals."""
+    importlib.invalidate_caches()
+    module_globals = globals()
+    for _, module_name, attribute, flag in OPTIONAL_DEPENDENCIES:
+        if module_globals[flag]:
+            continue
+        module = importlib.import_module(module_name)
+        module_globals[attribute or module_name] = getattr(module, attribute) if attribute else module
+        module_globals[flag] = True
+
 def ensure_dependencies():
     """Check and install required dependencies."""
-    missing = []
-    if not PDF_AVAILABLE:
-        missing.append("PyPDF2")
-    if not BS4_AVAILABLE:
-        missing.append("beautifulsoup4")
+    missing = [package for package, _, _, flag in OPTIONAL_DEPENDENCIES if not globals()[flag]]
 
     if missing:
         print(f"⚠️  Missing required dependencies: {', '.join(missing)}")
@@ -50,9 +65,10 @@ def ensure_dependencies():
             import subprocess
             for pkg in missing:
                 subprocess.run([sys.executable, "-m", "pip", "install", pkg], check=True)
+            _bind_dependencies()
             print("✓ Dependencies installed successfully")
             return True
-        except subprocess.CalledProcessError:
+        except (subprocess.CalledProcessError, ImportError):
             print("❌ Failed to install dependencies")
             return False
     return True
@@ -69,11 +85,11 @@ def extract_text_from_pdf(pdf_path):
 
             for page_num, page in enumerate(pdf_reader.pages):
                 try:
-                    text = page.extract_text()
-                    if text.strip():
+                    text = page.extract_text().strip()
+                    if text:
                         text_content.append({
                             "page": page_num + 1,
-                            "content": text.strip()
+                            "content": text
                         })
                 except Exception as e:
                     print(f"   Warning: Could not extract page {page_num + 1}: {e}")
@@ -179,6 +195,44 @@ def process_pdf(pdf_path):
     print(f"   ✓ Extracted {len(code_examples)} code examples, {len(api_references)} API references")
     return processed_data
 
+def _process_one_html(html_file, html_dir):
+    """Extract title and text from a single HTML file.
+
+    Runs in a worker process, so it must stay at module level.
+    Returns None for unreadable or insubstantial files.
+    """
+    try:
+        with open(html_file, 'r', encoding='utf-8') as f:
+            soup = BeautifulSoup(f.read(), 'html.parser')
+
+        # Extract title and main content
+        title = soup.find('title')
+        title_text = title.get_text() if title else "Unknown"
+
+        # Remove script and style elements
+        for script in soup(["script", "style"]):
+            script.decompose()
+
+        # Extract text content
+        content = soup.get_text()
+
+        # Clean up whitespace
+        lines = (line.strip() for line in content.splitlines())
+        content = '\n'.join(line for line in lines if line)
+
+        if len(content) > 100:  # Only include substantial content
+            return {
+                "file": str(html_file.relative_to(html_dir)),
+                "title": title_text.strip(),
+                "content": content[:2000],  # First 2000 chars
+                "length": len(content)
+            }
+
+    except Exception as e:
+        print(f"   Warning: Could not process {html_file}: {e}")
+
+    return None
+
 def process_html_files(html_dir):
     """Process HTML documentation files."""
     if not BS4_AVAILABLE:
@@ -192,38 +246,17 @@ def process_html_files(html_dir):
         print(f"   ⚠️  No HTML files found in {html_dir}")
         return None
 
+    # Parsing is CPU-bound and independent per file, so fan out to worker
+    # processes; results come back in input order.
+    batch = html_files[:10]  # Process first 10 files for now
+    chunksize = 4
     processed_content = []
-    for html_file in html_files[:10]:  # Process first 10 files for now
-        try:
-            with open(html_file, 'r', encoding='utf-8') as f:
-                soup = BeautifulSoup(f.read(), 'html.parser')
-
-                # Extract title and main content
-                title = soup.find('title')
-                title_text = title.get_text() if title else "Unknown"
-
-                # Remove script and style elements
-                for script in soup(["script", "style"]):
-                    script.decompose()
-
-                # Extract text content
-                content = soup.get_text()
-
-                # Clean up whitespace
-                lines = (line.strip() for line in content.splitlines())
-                content = '\n'.join(line for line in lines if line)
-
-                if len(content) > 100:  # Only include substantial content
-                    processed_content.append({
-                        "file": str(html_file.relative_to(html_dir)),
-                        "title": title_text.strip(),
-                        "content": content[:2000],  # First 2000 chars
-                        "length": len(content)
-                    })
-
-        except Exception as e:
-            print(f"   Warning: Could not process {html_file}: {e}")
-            continue
+    if batch:
+        # One worker per chunk at most; each extra worker is forked up front
+        max_workers = min(-(-len(batch) // chunksize), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = pool.map(_process_one_html, batch, [html_dir] * len(batch), chunksize=chunksize)
+            processed_content = [result for result in results if result]
 
     print(f"   ✓ Processed {len(processed_content)} HTML files")
     return {
@@ -281,13 +314,6 @@ def main():
     if not ensure_dependencies():
         sys.exit(1)
 
-    # Re-import after potential installation
-    global PyPDF2, BeautifulSoup
-    if not PDF_AVAILABLE:
-        import PyPDF2
-    if not BS4_AVAILABLE:
-        from bs4 import BeautifulSoup
-
     # Ensure output directory
     EXTRACTED_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -4,15 +4,93 @@ MCP Server with HTTP/SSE Transport
 This version uses Server-Sent Events over HTTP instead of stdio
 """
 
+import asyncio
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from string import Template
+
 from mcp.server.fastmcp import FastMCP
 from ansys_resource_loader import get_resource_content, resource_loader
 
+# Search results cache settings
+SEARCH_CACHE_SIZE = 256
+SEARCH_CACHE_TTL = 3600  # seconds
+
+
+class SearchCache:
+    """Thread-safe LRU cache whose entries expire after a fixed TTL."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """Store value under key, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+search_cache = SearchCache(SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL)
+resource_loader.on_invalidate(search_cache.clear)
+
+# Search query limits
+MIN_QUERY_LENGTH = 2
+MAX_SEARCH_RESULTS = 50
+WHITESPACE_RE = re.compile(r"\s+")
+
+# Source line format for each search result type
+SOURCE_LINE_FORMATS = {
+    'pdf': "**Source**: {source} (Page {page})\n",
+    'html': "**Source**: {title}\n",
+}
+
+
+class _ResultFields(dict):
+    """Search result fields for str.format_map, with a placeholder for missing ones."""
+
+    def __missing__(self, key):
+        return "Unknown Title"
+
+
+# Server address, overridable from the environment
+HOST = os.getenv("MCP_HOST", "127.0.0.1")
+PORT = int(os.getenv("MCP_PORT", "8001"))
+UDS_PATH = os.getenv("MCP_UDS")  # Serve on this Unix domain socket instead of TCP
+
 # Create MCP server instance with HTTP settings
 mcp = FastMCP(
     "Ansys Workbench Scripting Server",
-    host="127.0.0.1",
-    port=8001,
-    debug=True
+    host=HOST,
+    port=PORT,
+    debug=os.getenv("MCP_DEBUG") == "1"
 )
 
 # Ansys Workbench Scripting Resources
@@ -58,7 +136,7 @@ def get_api_reference() -> str:
 
 # Ansys-Specific Tools
 @mcp.tool()
-def search_ansys_docs(query: str, max_results: int = 10) -> str:
+async def search_ansys_docs(query: str, max_results: int = 10) -> str:
     """
     Search across all Ansys documentation (PDFs and HTML).
 
@@ -66,62 +144,72 @@ def search_ansys_docs(query: str, max_results: int = 10) -> str:
         query: Search query terms
         max_results: Maximum number of results to return (default: 10)
     """
-    from ansys_resource_loader import resource_loader
+    # Reject queries too short to be useful before scanning the whole corpus
+    query = WHITESPACE_RE.sub(" ", query).strip()
+    if len(query) < MIN_QUERY_LENGTH or max_results <= 0:
+        return f"No results found for query: '{query}'"
+    max_results = min(max_results, MAX_SEARCH_RESULTS)
 
-    results = resource_loader.search_content(query, max_results)
+    # Matching is case-insensitive, so cache the results under the lowercased
+    # query and format them per call to echo the query as it was given
+    cache_key = (query.lower(), max_results)
+    results = search_cache.get(cache_key)
+    if results is None:
+        results = await asyncio.to_thread(resource_loader.search_content, query, max_results)
+        search_cache.set(cache_key, results)
 
     if not results:
         return f"No results found for query: '{query}'"
 
-    search_output = f"# Search Results for: '{query}'\n\n"
-    search_output += f"Found {len(results)} relevant results:\n\n"
+    parts = [f"# Search Results for: '{query}'\n\n"]
+    parts.append(f"Found {len(results)} relevant results:\n\n")
 
     for i, result in enumerate(results, 1):
-        search_output += f"## Result {i}: {result['source']}\n"
-
-        if result['type'] == 'pdf':
-            search_output += f"**Source**: {result['source']} (Page {result['page']})\n"
-        else:
-            search_output += f"**Source**: {result.get('title', 'Unknown Title')}\n"
-
-        search_output += f"**Type**: {result['type'].upper()}\n"
-        search_output += f"**Relevance**: {result['relevance_score']:.3f}\n\n"
-        search_output += f"**Context**:\n{result['context']}\n\n"
-        search_output += "---\n\n"
+        result_type = result['type']
+        parts.append(f"## Result {i}: {result['source']}\n")
+        parts.append(SOURCE_LINE_FORMATS.get(result_type, SOURCE_LINE_FORMATS['html']).format_map(_ResultFields(result)))
+        parts.append(f"**Type**: {result_type.upper()}\n")
+        parts.append(f"**Relevance**: {result['relevance_score']:.3f}\n\n")
+        parts.append(f"**Context**:\n{result['context']}\n\n")
+        parts.append("---\n\n")
 
-    return search_output
+    return "".join(parts)
 
 @mcp.tool()
-def get_code_example(topic: str) -> str:
+async def get_code_example(topic: str) -> str:
     """
     Get code examples related to a specific topic.
 
     Args:
         topic: Topic or keyword to find code examples for
     """
-    from ansys_resource_loader import resource_loader
-
-    examples = resource_loader.get_code_examples()
-    relevant_examples = [ex for ex in examples if topic.lower() in ex.get('code', '').lower() or topic.lower() in ex.get('context', '').lower()]
+    relevant_examples = await asyncio.to_thread(resource_loader.find_code_examples, topic, 5)
 
     if not relevant_examples:
         return f"No code examples found for topic: '{topic}'"
 
-    output = f"# Code Examples for: '{topic}'\n\n"
+    parts = [f"# Code Examples for: '{topic}'\n\n"]
 
-    for i, example in enumerate(relevant_examples[:5], 1):  # Limit to 5 examples
-        output += f"## Example {i}\n"
-        output += f"**Source**: {example.get('source', 'Unknown')} (Page {example.get('page', 'N/A')})\n"
-        output += f"**Type**: {example.get('type', 'code')}\n\n"
-        output += f"```python\n{example.get('code', '')}\n```\n\n"
+    for i, example in enumerate(relevant_examples, 1):
+        parts.append(f"## Example {i}\n")
+        parts.append(f"**Source**: {example.get('source', 'Unknown')} (Page {example.get('page', 'N/A')})\n")
+        parts.append(f"**Type**: {example.get('type', 'code')}\n\n")
+        parts.append(f"```python\n{example.get('code', '')}\n```\n\n")
         if example.get('context'):
-            output += f"**Context**: {example['context'][:300]}...\n\n"
-        output += "---\n\n"
+            parts.append(f"**Context**: {example['context'][:300]}...\n\n")
+        parts.append("---\n\n")
+
+    return "".join(parts)
+
+@lru_cache(maxsize=16)
+def _chapter_list_md(pdf_name: str) -> str:
+    """Get the markdown list of chapter titles for a PDF."""
+    return "\n".join([f"- {ch.get('title', 'Unknown')}" for ch in resource_loader.get_pdf_chapters(pdf_name)])
 
-    return output
+resource_loader.on_invalidate(_chapter_list_md.cache_clear)
 
 @mcp.tool()
-def get_chapter_content(pdf_name: str, chapter_title: str) -> str:
+async def get_chapter_content(pdf_name: str, chapter_title: str) -> str:
     """
     Get content from a specific chapter in an Ansys PDF manual.
 
@@ -129,46 +217,29 @@ def get_chapter_content(pdf_name: str, chapter_title: str) -> str:
         pdf_name: Name of the PDF (e.g., 'scripting_mechanical_2025r1.pdf')
         chapter_title: Title or partial title of the chapter
     """
-    from ansys_resource_loader import resource_loader
-
-    chapter_content = resource_loader.get_pdf_content_by_chapter(pdf_name, chapter_title)
+    chapter_content = await asyncio.to_thread(resource_loader.get_pdf_content_by_chapter, pdf_name, chapter_title, 5000)
 
     if not chapter_content:
-        available_chapters = resource_loader.get_pdf_chapters(pdf_name)
-        chapter_list = "\n".join([f"- {ch.get('title', 'Unknown')}" for ch in available_chapters])
+        chapter_list = await asyncio.to_thread(_chapter_list_md, pdf_name)
         return f"Chapter '{chapter_title}' not found in {pdf_name}.\n\nAvailable chapters:\n{chapter_list}"
 
-    output = f"# {chapter_content.get('title', 'Unknown Chapter')}\n\n"
-    output += f"**Source**: {pdf_name}\n"
-    output += f"**Pages**: {chapter_content.get('start_page', 'N/A')} - {chapter_content.get('end_page', 'N/A')}\n\n"
+    parts = [f"# {chapter_content.get('title', 'Unknown Chapter')}\n\n"]
+    parts.append(f"**Source**: {pdf_name}\n")
+    parts.append(f"**Pages**: {chapter_content.get('start_page', 'N/A')} - {chapter_content.get('end_page', 'N/A')}\n\n")
 
-    content = chapter_content.get('content', '')
-    if len(content) > 5000:  # Truncate very long content
-        output += content[:5000] + "\n\n*[Content truncated - use search for specific topics]*"
-    else:
-        output += content
+    parts.append(chapter_content.get('content', ''))
+    if chapter_content.get('truncated'):  # Very long chapters are cut at 5000 characters
+        parts.append("\n\n*[Content truncated - use search for specific topics]*")
 
-    return output
+    return "".join(parts)
 
 # Ansys-Specific Prompts
-@mcp.prompt()
-def generate_ansys_script(task_description: str, ansys_version: str = "2025 R1", python_type: str = "CPython") -> str:
-    """
-    Generate Ansys Workbench automation script for a specific task.
-
-    Args:
-        task_description: Description of the automation task to accomplish
-        ansys_version: Target Ansys version (2024 R1, 2024 R2, 2025 R1, etc.)
-        python_type: Python implementation (CPython, IronPython)
-    """
-    framework = "PyMechanical (recommended)" if python_type.lower() == "cpython" else "IronPython scripting"
-
-    return f"""
+GENERATE_SCRIPT_TEMPLATE = Template("""
 Generate an Ansys Workbench automation script for the following task:
 
-**Task**: {task_description}
-**Target Version**: {ansys_version}
-**Python Framework**: {framework}
+**Task**: ${task_description}
+**Target Version**: ${ansys_version}
+**Python Framework**: ${framework}
 
 Please provide:
 
@@ -176,7 +247,7 @@ Please provide:
    - Proper imports and initialization
    - Error handling and validation
    - Clear comments explaining each step
-   - Best practices for {python_type}
+   - Best practices for ${python_type}
 
 2. **Setup Requirements**
    - Required Ansys modules/licenses
@@ -194,25 +265,29 @@ Please provide:
    - Proper resource cleanup
 
 Focus on modern Ansys automation best practices and include comprehensive error handling.
-Ensure the script follows Ansys {ansys_version} API patterns and conventions.
-"""
+Ensure the script follows Ansys ${ansys_version} API patterns and conventions.
+""")
 
 @mcp.prompt()
-def debug_ansys_error(error_message: str, context: str = "", ansys_version: str = "2025 R1") -> str:
+def generate_ansys_script(task_description: str, ansys_version: str = "2025 R1", python_type: str = "CPython") -> str:
     """
-    Help diagnose and resolve Ansys scripting errors.
+    Generate Ansys Workbench automation script for a specific task.
 
     Args:
-        error_message: The error message or exception encountered
-        context: Additional context about what was being attempted
-        ansys_version: Ansys version being used
+        task_description: Description of the automation task to accomplish
+        ansys_version: Target Ansys version (2024 R1, 2024 R2, 2025 R1, etc.)
+        python_type: Python implementation (CPython, IronPython)
     """
-    return f"""
+    framework = "PyMechanical (recommended)" if python_type.lower() == "cpython" else "IronPython scripting"
+
+    return GENERATE_SCRIPT_TEMPLATE.substitute(task_description=task_description, ansys_version=ansys_version, framework=framework, python_type=python_type)
+
+DEBUG_ERROR_TEMPLATE = Template("""
 Help diagnose and resolve this Ansys scripting error:
 
-**Error Message**: {error_message}
-**Context**: {context}
-**Ansys Version**: {ansys_version}
+**Error Message**: ${error_message}
+**Context**: ${context}
+**Ansys Version**: ${ansys_version}
 
 Please provide:
 
@@ -238,26 +313,29 @@ Please provide:
 
 Include specific code examples and explain the technical reasoning behind the solution.
 Focus on both immediate fixes and long-term code improvement strategies.
-"""
+""")
 
 @mcp.prompt()
-def convert_ironpython_to_cpython(ironpython_code: str, target_features: str = "basic conversion") -> str:
+def debug_ansys_error(error_message: str, context: str = "", ansys_version: str = "2025 R1") -> str:
     """
-    Convert IronPython Ansys scripts to CPython with PyMechanical.
+    Help diagnose and resolve Ansys scripting errors.
 
     Args:
-        ironpython_code: The IronPython code to convert
-        target_features: Specific features to enhance (basic conversion, error handling, modern patterns, etc.)
+        error_message: The error message or exception encountered
+        context: Additional context about what was being attempted
+        ansys_version: Ansys version being used
     """
-    return f"""
+    return DEBUG_ERROR_TEMPLATE.substitute(error_message=error_message, context=context, ansys_version=ansys_version)
+
+CONVERT_SCRIPT_TEMPLATE = Template("""
 Convert the following IronPython Ansys script to modern CPython using PyMechanical:
 
 **Original IronPython Code**:
 ```python
-{ironpython_code}
+${ironpython_code}
 ```
 
-**Target Features**: {target_features}
+**Target Features**: ${target_features}
 
 Please provide:
 
@@ -285,43 +363,100 @@ Please provide:
 
 Focus on creating maintainable, modern Python code that takes advantage of
 the full CPython ecosystem while maintaining compatibility with Ansys automation requirements.
+""")
+
+@mcp.prompt()
+def convert_ironpython_to_cpython(ironpython_code: str, target_features: str = "basic conversion") -> str:
+    """
+    Convert IronPython Ansys scripts to CPython with PyMechanical.
+
+    Args:
+        ironpython_code: The IronPython code to convert
+        target_features: Specific features to enhance (basic conversion, error handling, modern patterns, etc.)
+    """
+    return CONVERT_SCRIPT_TEMPLATE.substitute(ironpython_code=ironpython_code, target_features=target_features)
+
+# Startup banner, written in one call when the server is run directly
+STARTUP_BANNER = """\
+🚀 Starting Ansys Workbench Scripting MCP Server
+============================================================
+{address}
+
+🔧 Ansys Workbench Scripting Server Capabilities:
+  📄 9 Resources:
+    • ansys://workbench/overview - Workbench automation overview
+    • ansys://pymechanical/architecture - PyMechanical implementation details
+    • ansys://python/cpython-vs-ironpython - Python implementation comparison
+    • ansys://reference/quick-guide - Quick reference for common tasks
+    • ansys://act/development - ACT development guide
+    • ansys://dpf/post-processing - DPF post-processing reference
+    • ansys://scripting/examples - Comprehensive scripting examples
+    • ansys://api/reference - API reference documentation
+
+  🛠️  3 Tools:
+    • search_ansys_docs - Search across 2000+ pages of documentation
+    • get_code_example - Find code examples for specific topics
+    • get_chapter_content - Extract specific chapters from PDF manuals
+
+  🎯 3 Prompts:
+    • generate_ansys_script - Generate automation scripts
+    • debug_ansys_error - Diagnose and resolve scripting errors
+    • convert_ironpython_to_cpython - Migrate legacy scripts
+
+🎯 Purpose: Augment AI assistants with comprehensive Ansys Workbench scripting knowledge
+📚 Documentation: 40+ MB extracted from 2042 pages across 4 Ansys manuals + HTML docs
+🔍 Search: Full-text search across all documentation with relevance scoring
+
+Connect MCP Inspector to: {sse_url}
+Press Ctrl+C to stop the server
+============================================================
 """
 
+# ASGI application for running under an external server, e.g.
+#   uvicorn server_http:app --host 127.0.0.1 --port 8001
+_app = None
+
+def get_app():
+    """Get the SSE ASGI application, building it on first use."""
+    global _app
+    if _app is None:
+        _app = mcp.sse_app()
+    return _app
+
+def __getattr__(name):
+    # Resolve server_http.app lazily so plain imports skip building the Starlette app
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 # Run the server with SSE transport
 if __name__ == "__main__":
-    print("🚀 Starting Ansys Workbench Scripting MCP Server")
-    print("=" * 60)
-    print(f"Server URL: http://127.0.0.1:8001")
-    print(f"SSE Endpoint: http://127.0.0.1:8001/sse")
-    print("")
-    print("🔧 Ansys Workbench Scripting Server Capabilities:")
-    print("  📄 9 Resources:")
-    print("    • ansys://workbench/overview - Workbench automation overview")
-    print("    • ansys://pymechanical/architecture - PyMechanical implementation details")
-    print("    • ansys://python/cpython-vs-ironpython - Python implementation comparison")
-    print("    • ansys://reference/quick-guide - Quick reference for common tasks")
-    print("    • ansys://act/development - ACT development guide")
-    print("    • ansys://dpf/post-processing - DPF post-processing reference")
-    print("    • ansys://scripting/examples - Comprehensive scripting examples")
-    print("    • ansys://api/reference - API reference documentation")
-    print("")
-    print("  🛠️  3 Tools:")
-    print("    • search_ansys_docs - Search across 2000+ pages of documentation")
-    print("    • get_code_example - Find code examples for specific topics")
-    print("    • get_chapter_content - Extract specific chapters from PDF manuals")
-    print("")
-    print("  🎯 3 Prompts:")
-    print("    • generate_ansys_script - Generate automation scripts")
-    print("    • debug_ansys_error - Diagnose and resolve scripting errors")
-    print("    • convert_ironpython_to_cpython - Migrate legacy scripts")
-    print("")
-    print("🎯 Purpose: Augment AI assistants with comprehensive Ansys Workbench scripting knowledge")
-    print("📚 Documentation: 40+ MB extracted from 2042 pages across 4 Ansys manuals + HTML docs")
-    print("🔍 Search: Full-text search across all documentation with relevance scoring")
-    print("")
-    print("Connect MCP Inspector to: http://127.0.0.1:8001/sse")
-    print("Press Ctrl+C to stop the server")
-    print("=" * 60)
-
-    # Run with SSE transport (HTTP)
-    mcp.run(transport="sse")
\ No newline at end of file
+    # Only show the startup banner on a terminal; MCP_QUIET=1 also skips it
+    if sys.stdout.isatty() and os.getenv("MCP_QUIET") != "1":
+        if UDS_PATH:
+            address = f"Unix Socket: {UDS_PATH}"
+            sse_url = f"/sse on {UDS_PATH} (through a proxy that forwards HTTP to the socket)"
+        else:
+            sse_url = f"http://{HOST}:{PORT}/sse"
+            address = f"Server URL: http://{HOST}:{PORT}\nSSE Endpoint: {sse_url}"
+        sys.stdout.write(STARTUP_BANNER.format(address=address, sse_url=sse_url))
+        sys.stdout.flush()
+
+    # Load documentation and build resources now rather than on the first request
+    resource_loader.warm_up()
+    for pdf_name in resource_loader.get_pdf_data().get("pdfs", {}):
+        _chapter_list_md(pdf_name)
+
+    # Run with SSE transport (HTTP), over a Unix socket when MCP_UDS is set.
+    # uvicorn's loop="auto" uses uvloop when it is installed. Both asyncio and
+    # uvloop enable TCP_NODELAY on accepted TCP connections, so small SSE
+    # frames are not held back by Nagle's algorithm.
+    import uvicorn
+    uvicorn.run(
+        get_app(),
+        host=HOST,
+        port=PORT,
+        uds=UDS_PATH,
+        loop="auto",
+        log_level=mcp.settings.log_level.lower()
+    )
\ No newline at end of file
@@ -135,6 +135,47 @@ def test_tools_simulation():
     except Exception as e:
         print(f"   ❌ Chapter tool error: {e}")
 
+    # The shipped corpus has no code examples, so check the code example
+    # lookup and chapter truncation against a small synthetic PDF
+    print(f"\n3. Testing get_code_example and chapter truncation (synthetic data):")
+    try:
+        from ansys_resource_loader import AnsysResourceLoader
+        loader = AnsysResourceLoader()
+        examples = [
+            {"code": "Model.AddStaticStructuralAnalysis()", "context": "Create a static analysis"},
+            {"code": "mesh = Model.Mesh", "context": "Generate the MESH"},
+            {"code": "solution.Solve()", "context": ""},
+            {"code": "print('done')", "context": "Mesh statistics"},
+        ]
+        loader._pdf_cache = {"pdfs": {"synthetic.pdf": {
+            "code_examples": examples,
+            "chapters": [{"title": "Intro", "start_page": 1}, {"title": "Meshing", "start_page": 3}],
+            "pages": [{"page_number": n, "clean_text": f"page {n} " * 200} for n in range(1, 6)],
+        }}}
+
+        failures = 0
+        for topic in ["mesh", "MODEL", "solve()", "analysis", ")\nmesh", "dmesh", "missing", ""]:
+            for max_results in (1, 2, 5):
+                expected = [ex for ex in examples
+                            if topic.lower() in ex["code"].lower() or topic.lower() in ex["context"].lower()][:max_results]
+                if loader.find_code_examples(topic, max_results) != expected:
+                    failures += 1
+                    print(f"   ❌ find_code_examples({topic!r}, {max_results}) differs from a plain scan")
+
+        full = "\n".join(p["clean_text"] for p in loader.get_pdf_data()["pdfs"]["synthetic.pdf"]["pages"][:2])
+        for max_chars in (None, 100, len(full) - 1, len(full), len(full) + 1):
+            chapter = loader.get_pdf_content_by_chapter("synthetic.pdf", "intro", max_chars)
+            limit = len(full) if max_chars is None else max_chars
+            if chapter["content"] != full[:limit] or chapter["truncated"] != (limit < len(full)):
+                failures += 1
+                print(f"   ❌ Chapter content wrong with max_chars={max_chars}")
+
+        if not failures:
+            print(f"   ✅ Code example lookup and chapter truncation match expected output")
+
+    except Exception as e:
+        print(f"   ❌ Synthetic data error: {e}")
+
 def main():
     """Run all tests."""
     print("🔬 MCP Content Delivery Diagnostic")